@@ -17,7 +17,9 @@ DEFAULT_BASE_URL = "http://localhost:8000"
 def cli(ctx: click.Context, base_url: str) -> None:
     """Business Card Extractor CLI."""
     ctx.ensure_object(dict)
-    ctx.obj["base_url"] = base_url.rstrip("/")
+    client = httpx.Client(base_url=base_url, timeout=httpx.Timeout(600.0))
+    ctx.obj["client"] = client
+    ctx.call_on_close(client.close)
 
 
 @cli.command()
@@ -32,7 +34,7 @@ def cli(ctx: click.Context, base_url: str) -> None:
 @click.pass_context
 def batch(ctx: click.Context, **kwargs: object) -> None:
     """Run batch extraction."""
-    base = ctx.obj["base_url"]
+    client: httpx.Client = ctx.obj["client"]
 
     payload = {}
     if kwargs.get("drive_folder_id"):
@@ -49,9 +51,9 @@ def batch(ctx: click.Context, **kwargs: object) -> None:
     payload["concurrency"] = kwargs.get("concurrency", 3)
     payload["dryRun"] = bool(kwargs.get("dry_run"))
 
-    click.echo(f"→ POST {base}/batch/folder")
+    click.echo(f"→ POST {client.base_url}batch/folder")
     try:
-        resp = httpx.post(f"{base}/batch/folder", json=payload, timeout=600.0)
+        resp = client.post("/batch/folder", json=payload)
         resp.raise_for_status()
         data = resp.json()
         click.echo(json.dumps(data, indent=2))
@@ -67,9 +69,9 @@ def batch(ctx: click.Context, **kwargs: object) -> None:
 @click.pass_context
 def models(ctx: click.Context) -> None:
     """List available OpenRouter models."""
-    base = ctx.obj["base_url"]
+    client: httpx.Client = ctx.obj["client"]
     try:
-        resp = httpx.get(f"{base}/models", timeout=10.0)
+        resp = client.get("/models", timeout=10.0)
         resp.raise_for_status()
         click.echo(json.dumps(resp.json(), indent=2))
     except Exception as exc:
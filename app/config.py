@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import List
+from functools import cached_property, lru_cache
+from typing import FrozenSet, List
 
 from pydantic_settings import BaseSettings
 
@@ -34,11 +34,16 @@ class Settings(BaseSettings):
     CONCURRENCY_DEFAULT: int = 3
 
     # ── Derived helpers ─────────────────────────────
-    @property
+    @cached_property
     def allowed_models(self) -> List[str]:
-        """Parse the comma-separated model allowlist."""
+        """Parse the comma-separated model allowlist (once per instance)."""
         return [m.strip() for m in self.OPENROUTER_MODEL_ALLOWLIST.split(",") if m.strip()]
 
+    @cached_property
+    def allowed_model_set(self) -> FrozenSet[str]:
+        """The allowlist as a set, for membership checks."""
+        return frozenset(self.allowed_models)
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
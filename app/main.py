@@ -2,26 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager, closing
 from datetime import datetime, timezone
-from typing import Any
+from itertools import islice
+from typing import Any, AsyncIterator
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.config import get_settings
 from app.models import (
+    FILE_ERROR_ADAPTER,
     BatchRequest,
     BatchResponse,
-    FileError,
     HealthResponse,
     ModelsResponse,
     ServiceStatus,
 )
-from app.services import local_service
+from app.services import drive_service, local_service
 from app.services.drive_service import DriveService
 from app.services.extractor_service import process_batch
-from app.services.normalize_service import deduplicate_rows
 from app.services.openrouter_client import OpenRouterClient
 from app.services.sheets_service import SheetsService
 from app.utils.logging import get_logger, setup_logging
@@ -33,12 +36,29 @@ settings = get_settings()
 setup_logging(settings.LOG_LEVEL)
 logger = get_logger("main")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Own the shared HTTP clients (and their connection pools) for the app."""
+    app.state.or_client = OpenRouterClient(settings.OPENROUTER_API_KEY)
+    try:
+        yield
+    finally:
+        await app.state.or_client.aclose()
+        await drive_service.aclose()
+
+
 app = FastAPI(
     title="Business Card Extractor",
     version="1.0.0",
     description="Batch-extract business card data from images using vision models.",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Batch responses can carry thousands of rows (incl. rawText); compress them.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Mount static files to serve the frontend assets if needed, though we primarily use the root route
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -65,22 +85,25 @@ async def list_models() -> ModelsResponse:
 @app.get("/healthz", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
     """Report connectivity status for each backing service."""
-    or_client = OpenRouterClient(settings.OPENROUTER_API_KEY)
-    or_ok = await or_client.check_connectivity()
-
-    drive_ok = False
-    sheets_ok = False
-    if settings.GOOGLE_SERVICE_ACCOUNT_JSON:
-        try:
-            ds = DriveService(settings.GOOGLE_SERVICE_ACCOUNT_JSON)
-            drive_ok = ds.check_connectivity()
-        except Exception:
-            pass
-        try:
-            ss = SheetsService(settings.GOOGLE_SERVICE_ACCOUNT_JSON)
-            sheets_ok = ss.check_connectivity(settings.DEFAULT_SHEET_ID)
-        except Exception:
-            pass
+    or_client: OpenRouterClient = app.state.or_client
+    sa_json = settings.GOOGLE_SERVICE_ACCOUNT_JSON
+
+    def drive_probe() -> bool:
+        return bool(sa_json) and DriveService(sa_json).check_connectivity()
+
+    def sheets_probe() -> bool:
+        return bool(sa_json) and SheetsService(sa_json).check_connectivity(
+            settings.DEFAULT_SHEET_ID
+        )
+
+    # Probe all services at once; the blocking Google clients run in threads.
+    results = await asyncio.gather(
+        or_client.check_connectivity(),
+        asyncio.to_thread(drive_probe),
+        asyncio.to_thread(sheets_probe),
+        return_exceptions=True,
+    )
+    or_ok, drive_ok, sheets_ok = (res is True for res in results)
 
     return HealthResponse(
         status="healthy" if (or_ok and drive_ok and sheets_ok) else "degraded",
@@ -94,14 +117,14 @@ async def health_check() -> HealthResponse:
 
 
 @app.post("/batch/folder", response_model=BatchResponse)
-async def batch_folder(req: BatchRequest) -> BatchResponse:
+async def batch_folder(req: BatchRequest) -> ORJSONResponse:
     """Main batch extraction endpoint."""
 
     # 1. Resolve model
     model, err = validate_model_selection(
         req.model,
         settings.OPENROUTER_MODEL_DEFAULT,
-        settings.allowed_models,
+        settings.allowed_model_set,
     )
     if err:
         raise HTTPException(status_code=400, detail=err)
@@ -114,10 +137,14 @@ async def batch_folder(req: BatchRequest) -> BatchResponse:
     if req.driveFolderId:
         folder_mode = "drive"
         drive_svc = DriveService(settings.GOOGLE_SERVICE_ACCOUNT_JSON)
-        files = drive_svc.list_files(req.driveFolderId, recursive=req.recursive)
+        files = await drive_svc.list_files_async(req.driveFolderId, recursive=req.recursive)
     else:
         folder_mode = "local"
-        files = list(local_service.scan_folder(req.localFolderPath))  # type: ignore[arg-type]
+        # scan_folder is lazy, so the walk stops once maxFiles images are found
+        # (filesFound is then capped at maxFiles for local folders).
+        # Closing it right away logs local_folder_scanned before the batch runs.
+        with closing(local_service.scan_folder(req.localFolderPath)) as scan:  # type: ignore[arg-type]
+            files = list(islice(scan, req.maxFiles))
 
     files_found = len(files)
 
@@ -125,23 +152,20 @@ async def batch_folder(req: BatchRequest) -> BatchResponse:
     files = files[: req.maxFiles]
 
     # 4. Run extraction
-    or_client = OpenRouterClient(settings.OPENROUTER_API_KEY)
     result = await process_batch(
         files=files,
         concurrency=req.concurrency,
-        client=or_client,
+        client=app.state.or_client,
         model=model,
         drive_service=drive_svc,
     )
 
-    all_rows = result["rows"]
+    unique_rows = result["rows"]  # already deduplicated across the batch
+    rows_extracted = result["rows_extracted"]
     errors = result["errors"]
     files_processed = result["files_processed"]
 
-    # 5. Deduplicate
-    unique_rows = deduplicate_rows(all_rows)
-
-    # 6. Append to Sheets (unless dry-run)
+    # 5. Append to Sheets (unless dry-run)
     rows_appended = 0
     sheet_id = req.sheetId or settings.DEFAULT_SHEET_ID
     sheet_name = req.sheetName or settings.DEFAULT_SHEET_NAME or "Sheet1"
@@ -149,7 +173,7 @@ async def batch_folder(req: BatchRequest) -> BatchResponse:
     if not req.dryRun and sheet_id:
         try:
             sheets_svc = SheetsService(settings.GOOGLE_SERVICE_ACCOUNT_JSON)
-            rows_appended = sheets_svc.append_rows(sheet_id, sheet_name, unique_rows)
+            rows_appended = await sheets_svc.append_rows_async(sheet_id, sheet_name, unique_rows)
         except Exception as exc:
             logger.error("sheets_append_failed", error=str(exc))
             errors.append({"fileName": None, "fileId": None, "error": f"Sheets: {exc}"})
@@ -160,19 +184,23 @@ async def batch_folder(req: BatchRequest) -> BatchResponse:
         model=model,
         files_found=files_found,
         files_processed=files_processed,
-        rows_extracted=len(all_rows),
+        rows_extracted=rows_extracted,
         rows_appended=rows_appended,
     )
 
-    return BatchResponse(
+    # Rows are already normalised dicts: build the model without validation
+    # and return a ready Response so FastAPI skips re-validating the payload.
+    # ``response_model`` is kept for the OpenAPI schema.
+    response = BatchResponse.model_construct(
         status="ok",
         folderMode=folder_mode,
         modelUsed=model,
         filesFound=files_found,
         filesProcessed=files_processed,
-        rowsExtracted=len(all_rows),
+        rowsExtracted=rows_extracted,
         rowsAppended=rows_appended,
         dryRun=req.dryRun,
-        errors=[FileError(**e) for e in errors],
+        errors=[FILE_ERROR_ADAPTER.validate_python(e) for e in errors],
         rows=unique_rows,
     )
+    return ORJSONResponse(response.model_dump())
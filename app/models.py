@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any, List, Optional
 
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
 
 
 # ── Request Models ──────────────────────────────────────
@@ -19,8 +19,8 @@ class BatchRequest(BaseModel):
     sheetId: Optional[str] = None
     sheetName: Optional[str] = None
     dryRun: bool = False
-    maxFiles: int = 200
-    concurrency: int = 3
+    maxFiles: int = Field(200, ge=1)
+    concurrency: int = Field(3, ge=1, le=20)
     model: Optional[str] = None
 
     @model_validator(mode="after")
@@ -33,20 +33,6 @@ class BatchRequest(BaseModel):
             )
         return self
 
-    @field_validator("concurrency")
-    @classmethod
-    def concurrency_range(cls, v: int) -> int:
-        if v < 1 or v > 20:
-            raise ValueError("concurrency must be between 1 and 20")
-        return v
-
-    @field_validator("maxFiles")
-    @classmethod
-    def max_files_range(cls, v: int) -> int:
-        if v < 1:
-            raise ValueError("maxFiles must be at least 1")
-        return v
-
 
 # ── Row / Data Models ──────────────────────────────────
 
@@ -83,6 +69,10 @@ class FileError(BaseModel):
     error: str
 
 
+# Built once at import; reused for every per-file error in a batch response.
+FILE_ERROR_ADAPTER = TypeAdapter(FileError)
+
+
 class BatchResponse(BaseModel):
     """POST /batch/folder response."""
 
@@ -2,110 +2,152 @@
 
 from __future__ import annotations
 
-import io
-import json
-from pathlib import Path
+import asyncio
+import threading
 from typing import Any, Dict, List
 
+import httpx
+from google.auth.transport.requests import Request
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
 
+from app.utils.credentials import fresh_http, service_account_credentials, service_for
 from app.utils.logging import get_logger
 
 logger = get_logger("drive_service")
 
-SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
+SCOPES = ("https://www.googleapis.com/auth/drive.readonly",)
 
 IMAGE_MIME_TYPES = (
     "mimeType='image/jpeg' or mimeType='image/png' or mimeType='image/webp'"
 )
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+LIST_FIELDS = "nextPageToken, files(id, name, webViewLink, mimeType)"
+
+# Pooled client shared by every DriveService for the async REST calls.
+_http: httpx.AsyncClient | None = None
+_refresh_lock = threading.Lock()
 
 
 class DriveService:
     """Wraps Google Drive API v3 for listing and downloading images."""
 
     def __init__(self, service_account_json: str) -> None:
-        creds = self._build_credentials(service_account_json)
-        self.service = build("drive", "v3", credentials=creds)
+        self.credentials = service_account_credentials(service_account_json, SCOPES)
+        self.service = service_for(service_account_json, "drive", "v3", SCOPES)
 
     # ── Public API ──────────────────────────────────
 
-    def list_files(
+    async def list_files_async(
         self, folder_id: str, recursive: bool = False
     ) -> List[Dict[str, Any]]:
-        """Return a list of image file metadata dicts in *folder_id*."""
-        files = self._list_images_in_folder(folder_id)
-
-        if recursive:
-            subfolder_ids = self._list_subfolders(folder_id)
-            for sub_id in subfolder_ids:
-                files.extend(self.list_files(sub_id, recursive=True))
+        """Return a list of image file metadata dicts in *folder_id*.
+
+        Folders are walked breadth-first and every folder on a level is
+        listed concurrently over the shared HTTP pool.
+        """
+        files: List[Dict[str, Any]] = []
+        seen = {folder_id}
+        level = [folder_id]
+
+        while level:
+            next_level: List[str] = []
+            listings = await asyncio.gather(*[self._list_folder_async(f) for f in level])
+            for entries in listings:
+                for entry in entries:
+                    if entry.get("mimeType") != FOLDER_MIME_TYPE:
+                        files.append(entry)
+                    elif recursive and entry["id"] not in seen:
+                        seen.add(entry["id"])
+                        next_level.append(entry["id"])
+            level = next_level
 
         logger.info("drive_files_listed", folder_id=folder_id, count=len(files))
         return files
 
-    def download_file(self, file_id: str) -> bytes:
-        """Download and return the raw bytes of *file_id*."""
-        request = self.service.files().get_media(fileId=file_id)
-        buffer = io.BytesIO()
-        downloader = MediaIoBaseDownload(buffer, request)
+    async def download_file_async(self, file_id: str) -> bytes:
+        """Download and return the raw bytes of *file_id*.
 
-        done = False
-        while not done:
-            _, done = downloader.next_chunk()
-
-        logger.info("drive_file_downloaded", file_id=file_id, size=buffer.tell())
-        return buffer.getvalue()
+        Card images are small, so the media is fetched with a single GET
+        rather than in resumable chunks.
+        """
+        resp = await _get_http().get(
+            f"{DRIVE_FILES_URL}/{file_id}",
+            params={"alt": "media"},
+            headers=await self._auth_headers(),
+        )
+        resp.raise_for_status()
+        logger.info("drive_file_downloaded", file_id=file_id, size=len(resp.content))
+        return resp.content
 
     def check_connectivity(self) -> bool:
         """Quick connectivity check — try to list 1 file in root."""
         try:
-            self.service.files().list(pageSize=1, fields="files(id)").execute()
+            self.service.files().list(pageSize=1, fields="files(id)").execute(
+                http=fresh_http(self.credentials)
+            )
             return True
         except Exception:
             return False
 
     # ── Private helpers ─────────────────────────────
 
-    def _list_images_in_folder(self, folder_id: str) -> List[Dict[str, Any]]:
-        query = f"'{folder_id}' in parents and ({IMAGE_MIME_TYPES})"
+    async def _list_folder_async(self, folder_id: str) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {
+            "q": _children_query(folder_id),
+            "fields": LIST_FIELDS,
+            "pageSize": 1000,
+        }
         results: List[Dict[str, Any]] = []
-        page_token = None
 
         while True:
-            resp = (
-                self.service.files()
-                .list(
-                    q=query,
-                    fields="nextPageToken, files(id, name, webViewLink, mimeType)",
-                    pageSize=1000,
-                    pageToken=page_token,
-                )
-                .execute()
+            resp = await _get_http().get(
+                DRIVE_FILES_URL, params=params, headers=await self._auth_headers()
             )
-            results.extend(resp.get("files", []))
-            page_token = resp.get("nextPageToken")
-            if not page_token:
-                break
-
-        return results
-
-    def _list_subfolders(self, folder_id: str) -> List[str]:
-        query = f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.folder'"
-        resp = (
-            self.service.files()
-            .list(q=query, fields="files(id)", pageSize=1000)
-            .execute()
+            resp.raise_for_status()
+            data = resp.json()
+            results.extend(data.get("files", []))
+            if not data.get("nextPageToken"):
+                return results
+            params["pageToken"] = data["nextPageToken"]
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        if not self.credentials.valid:
+            await asyncio.to_thread(_refresh_credentials, self.credentials)
+        return {"Authorization": f"Bearer {self.credentials.token}"}
+
+
+# ── Private helpers ─────────────────────────────────────
+
+
+def _children_query(folder_id: str) -> str:
+    """Drive query matching the images and subfolders directly in *folder_id*."""
+    return (
+        f"'{folder_id}' in parents and "
+        f"({IMAGE_MIME_TYPES} or mimeType='{FOLDER_MIME_TYPE}')"
+    )
+
+
+def _refresh_credentials(creds: service_account.Credentials) -> None:
+    """Refresh the access token once, even when many workers need it at once."""
+    with _refresh_lock:
+        if not creds.valid:
+            creds.refresh(Request())
+
+
+def _get_http() -> httpx.AsyncClient:
+    global _http
+    if _http is None or _http.is_closed:
+        _http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64),
+            timeout=httpx.Timeout(60.0, connect=10.0),
         )
-        return [f["id"] for f in resp.get("files", [])]
-
-    @staticmethod
-    def _build_credentials(raw: str) -> service_account.Credentials:
-        """Accept either a JSON string or a file path."""
-        raw = raw.strip()
-        if raw.startswith("{"):
-            info = json.loads(raw)
-        else:
-            info = json.loads(Path(raw).read_text(encoding="utf-8"))
-        return service_account.Credentials.from_service_account_info(info, scopes=SCOPES)
+    return _http
+
+
+async def aclose() -> None:
+    """Close the shared async HTTP client (called on app shutdown)."""
+    if _http is not None:
+        await _http.aclose()
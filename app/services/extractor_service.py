@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import mimetypes
-from asyncio import Semaphore, gather
+from asyncio import Queue, Semaphore, gather, to_thread
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from app.services.normalize_service import normalize_row
+from app.services.normalize_service import deduplicate_rows, normalize_rows
 from app.services.openrouter_client import OpenRouterClient
 from app.utils.logging import get_logger
 
@@ -34,75 +37,92 @@ async def process_batch(
 
     Returns
     -------
-    dict with keys ``rows``, ``errors``, ``files_processed``.
+    dict with keys ``rows`` (deduplicated), ``rows_extracted`` (count before
+    deduplication), ``errors``, ``files_processed``.
     """
-    semaphore = Semaphore(concurrency)
+    # Downloads and model calls run as a pipeline: producers fetch image
+    # bytes into a bounded queue while consumers run the vision calls, so
+    # download latency is hidden behind model latency.
+    queue: Queue[Optional[tuple[int, Dict[str, Any], Any]]] = Queue(maxsize=concurrency)
+    io_semaphore = Semaphore(concurrency)
+    results: List[Any] = [None] * len(files)
+    # Rows without a timestamp share one batch-wide default.
+    batch_ts = datetime.now(timezone.utc).isoformat()
+
+    async def _process_one(file_info: Dict[str, Any], image: Any) -> Dict[str, Any]:
+        file_name = file_info.get("fileName") or file_info.get("name", "unknown")
+        file_id = file_info.get("fileId") or file_info.get("id")
+        file_link = file_info.get("fileLink") or file_info.get("webViewLink")
+        try:
+            # 1. Surface any download failure
+            if isinstance(image, Exception):
+                raise image
+            image_bytes, mime_type = image
+
+            # 2. Build file metadata for the prompt
+            file_meta = {"fileName": file_name, "fileId": file_id, "fileLink": file_link}
+
+            # 3. Extract via vision model
+            raw_rows = await client.extract_card_data(
+                image_bytes, mime_type, file_meta, model
+            )
 
-    async def _process_one(file_info: Dict[str, Any]) -> Dict[str, Any]:
-        async with semaphore:
-            file_name = file_info.get("fileName") or file_info.get("name", "unknown")
-            try:
-                # 1. Read image bytes
-                image_bytes, mime_type = await _read_image(file_info, drive_service)
-
-                # 2. Build file metadata for the prompt
-                file_meta = {
-                    "fileName": file_name,
-                    "fileId": file_info.get("fileId") or file_info.get("id"),
-                    "fileLink": file_info.get("fileLink") or file_info.get("webViewLink"),
-                }
+            # 4. Normalise each row (the client has stamped file_meta on it)
+            normalised = normalize_rows(raw_rows, default_ts=batch_ts)
 
-                # 3. Extract via vision model
-                raw_rows = await client.extract_card_data(
-                    image_bytes, mime_type, file_meta, model
-                )
-
-                # 4. Normalise each row + inject metadata
-                normalised = []
-                for row in raw_rows:
-                    row.setdefault("fileName", file_meta["fileName"])
-                    row.setdefault("fileId", file_meta["fileId"])
-                    row.setdefault("fileLink", file_meta["fileLink"])
-                    normalised.append(normalize_row(row))
-
-                logger.info(
-                    "file_processed",
-                    file_name=file_name,
-                    rows_extracted=len(normalised),
-                )
-                return {"status": "ok", "rows": normalised}
+            logger.info(
+                "file_processed",
+                file_name=file_name,
+                rows_extracted=len(normalised),
+            )
+            return {"status": "ok", "rows": normalised}
 
+        except Exception as exc:
+            logger.error(
+                "file_processing_failed",
+                file_name=file_name,
+                error=str(exc),
+            )
+            return {
+                "status": "error",
+                "fileName": file_name,
+                "fileId": file_id,
+                "error": str(exc),
+            }
+
+    async def _fetch_one(index: int, file_info: Dict[str, Any]) -> None:
+        # The I/O slot is held until the queue accepts the bytes, which caps
+        # how many downloaded images wait in memory.
+        async with io_semaphore:
+            try:
+                image: Any = await _read_image(file_info, drive_service)
             except Exception as exc:
-                logger.error(
-                    "file_processing_failed",
-                    file_name=file_name,
-                    error=str(exc),
-                )
-                return {
-                    "status": "error",
-                    "fileName": file_name,
-                    "fileId": file_info.get("fileId") or file_info.get("id"),
-                    "error": str(exc),
-                }
+                image = exc
+            await queue.put((index, file_info, image))
+
+    async def _produce() -> None:
+        try:
+            await gather(*[_fetch_one(i, f) for i, f in enumerate(files)])
+        finally:
+            for _ in range(concurrency):
+                await queue.put(None)
+
+    async def _consume() -> None:
+        while (item := await queue.get()) is not None:
+            index, file_info, image = item
+            results[index] = await _process_one(file_info, image)
 
-    # Launch all tasks
-    results = await gather(
-        *[_process_one(f) for f in files],
-        return_exceptions=True,
-    )
+    await gather(_produce(), *[_consume() for _ in range(concurrency)])
 
     # Aggregate
-    all_rows: List[Dict[str, Any]] = []
+    row_batches: List[List[Dict[str, Any]]] = []
     errors: List[Dict[str, Any]] = []
     processed = 0
 
     for res in results:
-        if isinstance(res, Exception):
-            errors.append({"fileName": "unknown", "error": str(res)})
-            continue
         processed += 1
         if res["status"] == "ok":
-            all_rows.extend(res["rows"])
+            row_batches.append(res["rows"])
         else:
             errors.append(
                 {
@@ -112,8 +132,11 @@ async def process_batch(
                 }
             )
 
+    # Deduplicate straight from the per-file lists (in file order) rather
+    # than concatenating every row into an intermediate list first.
     return {
-        "rows": all_rows,
+        "rows": deduplicate_rows(chain.from_iterable(row_batches)),
+        "rows_extracted": sum(map(len, row_batches)),
         "errors": errors,
         "files_processed": processed,
     }
@@ -132,14 +155,19 @@ async def _read_image(
         p = Path(local_path)
         if not p.is_file():
             raise FileNotFoundError(f"Image not found: {local_path}")
-        mime = mimetypes.guess_type(str(p))[0] or "image/jpeg"
-        return p.read_bytes(), mime
+        return await to_thread(p.read_bytes), _mime_for_suffix(p.suffix.lower())
 
     # Drive mode
     file_id = file_info.get("id") or file_info.get("fileId")
     if not file_id or not drive_service:
         raise ValueError("Cannot determine image source (no filePath or Drive fileId)")
 
-    image_bytes = drive_service.download_file(file_id)
+    image_bytes = await drive_service.download_file_async(file_id)
     mime = file_info.get("mimeType") or "image/jpeg"
     return image_bytes, mime
+
+
+@lru_cache(maxsize=16)
+def _mime_for_suffix(suffix: str) -> str:
+    """Map a lowercased file suffix to its MIME type (default JPEG)."""
+    return mimetypes.guess_type(f"x{suffix}")[0] or "image/jpeg"
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Any, Dict, Generator
 
@@ -17,20 +18,38 @@ def scan_folder(folder_path: str) -> Generator[Dict[str, Any], None, None]:
 
     Each dict mirrors the shape expected by the extractor:
     ``{fileName, filePath, fileId, fileLink}``
+
+    The tree is walked once with ``os.scandir``; entry types come from the
+    directory listing itself, so no per-file ``stat`` call is made.
+    Unreadable subdirectories are skipped, as ``Path.rglob`` does.
     """
     root = Path(folder_path)
     if not root.is_dir():
         raise FileNotFoundError(f"Local folder not found: {folder_path}")
 
     count = 0
-    for ext in ALLOWED_EXTENSIONS:
-        for img_path in root.rglob(f"*{ext}"):
-            count += 1
-            yield {
-                "fileName": img_path.name,
-                "filePath": str(img_path),
-                "fileId": None,
-                "fileLink": None,
-            }
-
-    logger.info("local_folder_scanned", folder=folder_path, images_found=count)
+    stack = [str(root)]
+    try:
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except PermissionError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif (
+                        os.path.splitext(entry.name)[1].lower() in ALLOWED_EXTENSIONS
+                        and entry.is_file()
+                    ):
+                        count += 1
+                        yield {
+                            "fileName": entry.name,
+                            "filePath": entry.path,
+                            "fileId": None,
+                            "fileLink": None,
+                        }
+    finally:
+        # Also runs when the caller stops iterating early.
+        logger.info("local_folder_scanned", folder=folder_path, images_found=count)
@@ -4,52 +4,67 @@ from __future__ import annotations
 
 import re
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_PHONE_RE = re.compile(r"[^\d]")
+_EMAIL_RE = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
+_WS_RE = re.compile(r"\s+")
 
 
 # ── Normalization ───────────────────────────────────────
 
 
-def normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
-    """Apply strict normalization rules to a single extracted row."""
+def normalize_row(row: Dict[str, Any], default_ts: Optional[str] = None) -> Dict[str, Any]:
+    """Apply strict normalization rules to a single extracted row.
+
+    *default_ts* fills a missing timestamp; it defaults to UTC now.
+    """
+    get = row.get
     return {
-        "timestamp": _default_timestamp(row.get("timestamp")),
-        "fullName": _to_str(row.get("fullName")),
-        "jobTitle": _to_str(row.get("jobTitle")),
-        "company": _to_str(row.get("company")),
-        "phone1": _normalize_phone(row.get("phone1")),
-        "phone2": _normalize_phone(row.get("phone2")),
-        "email1": _normalize_email(row.get("email1")),
-        "email2": _normalize_email(row.get("email2")),
-        "website": _normalize_website(row.get("website")),
-        "address": _to_str(row.get("address")),
-        "notes": _to_str(row.get("notes")),
-        "confidence": _clamp_confidence(row.get("confidence")),
-        "rawText": _to_str(row.get("rawText")),
-        "fileName": _to_str(row.get("fileName")),
-        "fileId": _to_str(row.get("fileId")),
-        "fileLink": _to_str(row.get("fileLink")),
+        "timestamp": _default_timestamp(get("timestamp"), default_ts),
+        "fullName": _to_str(get("fullName")),
+        "jobTitle": _to_str(get("jobTitle")),
+        "company": _to_str(get("company")),
+        "phone1": _normalize_phone(get("phone1")),
+        "phone2": _normalize_phone(get("phone2")),
+        "email1": _normalize_email(get("email1")),
+        "email2": _normalize_email(get("email2")),
+        "website": _normalize_website(get("website")),
+        "address": _to_str(get("address")),
+        "notes": _to_str(get("notes")),
+        "confidence": _clamp_confidence(get("confidence")),
+        "rawText": _to_str(get("rawText")),
+        "fileName": _to_str(get("fileName")),
+        "fileId": _to_str(get("fileId")),
+        "fileLink": _to_str(get("fileLink")),
     }
 
 
+def normalize_rows(
+    rows: Iterable[Dict[str, Any]], default_ts: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Normalize *rows*, sharing one default timestamp across all of them."""
+    if default_ts is None:
+        default_ts = datetime.now(timezone.utc).isoformat()
+    return [normalize_row(row, default_ts) for row in rows]
+
+
 # ── Deduplication ───────────────────────────────────────
 
 
-def deduplicate_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def deduplicate_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Deduplicate across the entire batch using composite keys.
 
     Keep first occurrence only.
     """
-    seen_keys: set[str] = set()
-    unique_rows: List[Dict[str, Any]] = []
+    unique: Dict[Tuple[str, ...], Dict[str, Any]] = {}
 
     for row in rows:
         key = _dedup_key(row)
-        if key not in seen_keys:
-            seen_keys.add(key)
-            unique_rows.append(row)
+        if key not in unique:
+            unique[key] = row
 
-    return unique_rows
+    return list(unique.values())
 
 
 # ── Private helpers ─────────────────────────────────────
@@ -67,7 +82,7 @@ def _normalize_phone(val: Any) -> Optional[str]:
     """Strip everything except digits."""
     if val is None:
         return None
-    digits = re.sub(r"[^\d]", "", str(val))
+    digits = _PHONE_RE.sub("", str(val))
     return digits if digits else None
 
 
@@ -76,7 +91,7 @@ def _normalize_email(val: Any) -> Optional[str]:
     if val is None:
         return None
     email = str(val).strip().lower()
-    if re.match(r"^[^@]+@[^@]+\.[^@]+$", email):
+    if _EMAIL_RE.match(email):
         return email
     return None
 
@@ -85,7 +100,7 @@ def _normalize_website(val: Any) -> Optional[str]:
     """Remove internal whitespace."""
     if val is None:
         return None
-    site = re.sub(r"\s+", "", str(val).strip())
+    site = _WS_RE.sub("", str(val).strip())
     return site if site else None
 
 
@@ -100,20 +115,23 @@ def _clamp_confidence(val: Any) -> Optional[float]:
         return None
 
 
-def _default_timestamp(val: Any) -> str:
-    """Return the existing value or default to UTC now in ISO-8601."""
+def _default_timestamp(val: Any, default: Optional[str] = None) -> str:
+    """Return the existing value, else *default*, else UTC now in ISO-8601."""
     if val:
         s = str(val).strip()
         if s:
             return s
-    return datetime.now(timezone.utc).isoformat()
+    return default or datetime.now(timezone.utc).isoformat()
 
 
-def _dedup_key(row: Dict[str, Any]) -> str:
+def _dedup_key(row: Dict[str, Any]) -> Tuple[str, ...]:
     """Generate a composite dedup key for a row."""
-    if row.get("email1"):
-        return f"email:{row['email1']}"
-    phone = row.get("phone1") or ""
-    name = (row.get("fullName") or "").lower()
-    company = (row.get("company") or "").lower()
-    return f"fallback:{phone}|{name}|{company}"
+    email = row.get("email1")
+    if email:
+        return ("email", email)
+    return (
+        "fallback",
+        row.get("phone1") or "",
+        (row.get("fullName") or "").lower(),
+        (row.get("company") or "").lower(),
+    )
@@ -3,18 +3,32 @@
 from __future__ import annotations
 
 import asyncio
-import base64
-import json
+import copy
+import hashlib
 import mimetypes
-from typing import Any, Dict, List, Optional
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 import httpx
+import orjson
+import pybase64
 
 from app.utils.logging import get_logger
 
 logger = get_logger("openrouter_client")
 
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_MODELS_URL = "https://openrouter.ai/api/v1/models"
+
+# Seconds a connectivity-check result is reused.
+CONNECTIVITY_TTL = 30.0
+
+# Sized well above ``BatchRequest.concurrency`` (max 20) so concurrent batches
+# never queue on the pool or evict warm keep-alive connections.
+HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=256)
 
 EXTRACTION_SYSTEM_PROMPT = """\
 You are a strict JSON extraction agent for business card images.
@@ -70,6 +84,22 @@ Return format example:
 }
 """
 
+# Retry backoff: min(cap, base * 2**attempt) scaled by up to +50% jitter so
+# concurrent workers don't retry in lockstep.
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_CAP = 30.0
+RETRY_JITTER = 0.5
+_rng = random.Random()
+
+# Markdown code fence around the JSON: the opening line (with any language
+# tag) is dropped, the closing fence is optional.
+_FENCE_RE = re.compile(r"\A\s*```(?:[^\n]*\n)?(.*?)(?:```)?\s*\Z", re.S)
+
+# The system prompt never changes: encode it once and splice the bytes into
+# every request body (see ``_call_api``).
+SYSTEM_MESSAGE = {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT}
+_SYSTEM_MESSAGE_JSON = orjson.dumps(SYSTEM_MESSAGE)
+
 REPAIR_PROMPT_TEMPLATE = (
     "The JSON you provided was invalid. Error: {error}\n"
     "Please fix and return ONLY valid JSON with no additional text."
@@ -79,9 +109,27 @@ REPAIR_PROMPT_TEMPLATE = (
 class OpenRouterClient:
     """Async client for OpenRouter vision chat completions."""
 
-    def __init__(self, api_key: str, timeout: float = 120.0) -> None:
+    def __init__(self, api_key: str, timeout: float = 120.0, cache_size: int = 512) -> None:
         self.api_key = api_key
         self.timeout = timeout
+        # LRU of parsed rows keyed by (model, image digest); 0 disables it.
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, str], List[Dict[str, Any]]] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._conn_cache: Optional[tuple[float, bool]] = None
+        self._conn_inflight: Optional[asyncio.Future[bool]] = None
+        # One long-lived HTTP/2 client so every call reuses warm connections.
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(connect=10.0, read=timeout, write=30.0, pool=30.0),
+            limits=HTTP_LIMITS,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+                "X-Title": "Business Card Extractor",
+            },
+        )
 
     # ── Public API ──────────────────────────────────
 
@@ -91,12 +139,32 @@ class OpenRouterClient:
         mime_type: str,
         file_meta: Dict[str, Any],
         model: str,
+        prefer_url: bool = False,
     ) -> List[Dict[str, Any]]:
         """Send an image to the vision model and return the parsed rows.
 
         Includes one repair-retry if the first response is invalid JSON.
+        Every returned row carries the entries of *file_meta*, overriding
+        whatever the model echoed for them.
+
+        With *prefer_url*, an HTTPS ``fileLink`` the model can fetch itself is
+        sent instead of the base64-encoded bytes (smaller request, no encode
+        pass). Drive ``webViewLink`` pages need auth, so callers only set it
+        for publicly reachable image URLs.
         """
-        data_url = self._bytes_to_data_url(image_bytes, mime_type)
+        file_link = file_meta.get("fileLink")
+        use_url = prefer_url and isinstance(file_link, str) and file_link.startswith("https://")
+
+        # Re-scanned / duplicate uploads skip the model call entirely.
+        digest = hashlib.blake2b(
+            file_link.encode() if use_url else image_bytes, digest_size=16
+        ).hexdigest()
+        cache_key = (model, digest)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return self._with_file_meta(cached, file_meta)
+
+        image_url = file_link if use_url else self._bytes_to_data_url(image_bytes, mime_type)
         user_text = (
             f"Extract contact data from this business card. "
             f"Metadata: fileName={file_meta.get('fileName')}, "
@@ -106,11 +174,11 @@ class OpenRouterClient:
         )
 
         messages = [
-            {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+            SYSTEM_MESSAGE,
             {
                 "role": "user",
                 "content": [
-                    {"type": "image_url", "image_url": {"url": data_url}},
+                    {"type": "image_url", "image_url": {"url": image_url}},
                     {"type": "text", "text": user_text},
                 ],
             },
@@ -120,7 +188,10 @@ class OpenRouterClient:
         raw_text = await self._call_api(model, messages)
         rows, error = self._parse_rows(raw_text)
         if rows is not None:
-            return rows
+            # An empty result may be a bad read; leave it free to be redone.
+            if rows:
+                self._cache_put(cache_key, rows)
+            return self._with_file_meta(rows, file_meta)
 
         # Repair retry (once)
         logger.warning(
@@ -135,23 +206,104 @@ class OpenRouterClient:
         raw_text = await self._call_api(model, messages)
         rows, error = self._parse_rows(raw_text)
         if rows is not None:
-            return rows
+            # An empty result may be a bad read; leave it free to be redone.
+            if rows:
+                self._cache_put(cache_key, rows)
+            return self._with_file_meta(rows, file_meta)
 
         raise ValueError(f"Invalid JSON after repair retry: {error}")
 
+    async def extract_many(
+        self,
+        items: Iterable[tuple[bytes, str, Dict[str, Any]]],
+        model: str,
+        concurrency: int = 8,
+    ) -> List[Union[List[Dict[str, Any]], Exception]]:
+        """Run ``extract_card_data`` for many ``(bytes, mime, meta)`` items.
+
+        At most *concurrency* calls are in flight on the shared connection
+        pool. Results keep input order; a failed item yields its exception
+        instead of aborting the others.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(item: tuple[bytes, str, Dict[str, Any]]) -> Any:
+            image_bytes, mime_type, file_meta = item
+            async with semaphore:
+                try:
+                    return await self.extract_card_data(image_bytes, mime_type, file_meta, model)
+                except Exception as exc:
+                    return exc
+
+        return await asyncio.gather(*[_one(item) for item in items])
+
     async def check_connectivity(self) -> bool:
-        """Quick API reachability check."""
+        """Quick API reachability check.
+
+        The result is cached for ``CONNECTIVITY_TTL`` seconds and concurrent
+        callers share a single in-flight request.
+        """
+        if self._conn_cache is not None:
+            checked_at, ok = self._conn_cache
+            if time.monotonic() - checked_at < CONNECTIVITY_TTL:
+                return ok
+        if self._conn_inflight is None:
+            self._conn_inflight = asyncio.ensure_future(self._probe_connectivity())
+        # Shielded so one cancelled caller doesn't cancel the shared probe.
+        return await asyncio.shield(self._conn_inflight)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Return hit / miss counters and size of the extraction cache."""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "maxsize": self.cache_size,
+            "currsize": len(self._cache),
+        }
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
+
+    # ── Private helpers ─────────────────────────────
+
+    async def _probe_connectivity(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(
-                    "https://openrouter.ai/api/v1/models",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                )
-                return resp.status_code == 200
+            resp = await self._client.get(OPENROUTER_MODELS_URL, timeout=10.0)
+            ok = resp.status_code == 200
         except Exception:
-            return False
+            ok = False
+        finally:
+            self._conn_inflight = None
+        self._conn_cache = (time.monotonic(), ok)
+        return ok
+
+    def _cache_get(self, key: tuple[str, str]) -> Optional[List[Dict[str, Any]]]:
+        """Return a private copy of the cached rows for *key*, if any."""
+        rows = self._cache.get(key)
+        if rows is None:
+            self._cache_misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self._cache_hits += 1
+        return copy.deepcopy(rows)
 
-    # ── Private helpers ─────────────────────────────
+    @staticmethod
+    def _with_file_meta(
+        rows: List[Dict[str, Any]], file_meta: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Stamp the caller's file metadata over whatever the model echoed."""
+        for row in rows:
+            row.update(file_meta)
+        return rows
+
+    def _cache_put(self, key: tuple[str, str], rows: List[Dict[str, Any]]) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = copy.deepcopy(rows)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
 
     async def _call_api(
         self,
@@ -159,33 +311,37 @@ class OpenRouterClient:
         messages: List[Dict[str, Any]],
         max_retries: int = 3,
     ) -> str:
-        """POST to OpenRouter with exponential-backoff retry on network errors."""
-        payload = {"model": model, "messages": messages}
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "X-Title": "Business Card Extractor",
-        }
+        """POST to OpenRouter, retrying network errors, 408/429 and 5xx.
+
+        Waits use capped, jittered exponential backoff unless the server
+        sends ``Retry-After``; other 4xx responses fail immediately.
+        """
+        encoded = [
+            _SYSTEM_MESSAGE_JSON if msg is SYSTEM_MESSAGE else orjson.dumps(msg)
+            for msg in messages
+        ]
+        body = b'{"model":%b,"messages":[%b]}' % (orjson.dumps(model), b",".join(encoded))
 
         last_exc: Optional[Exception] = None
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    resp = await client.post(
-                        OPENROUTER_API_URL,
-                        json=payload,
-                        headers=headers,
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-                    return data["choices"][0]["message"]["content"]
+                resp = await self._client.post(OPENROUTER_API_URL, content=body)
+                resp.raise_for_status()
+                data = orjson.loads(resp.content)
+                return data["choices"][0]["message"]["content"]
             except (httpx.HTTPStatusError, httpx.RequestError, KeyError) as exc:
                 last_exc = exc
-                wait = 2 ** attempt
+                if isinstance(exc, httpx.HTTPStatusError) and not _is_retryable(
+                    exc.response.status_code
+                ):
+                    raise RuntimeError(f"OpenRouter API rejected the request: {exc}") from exc
+                if attempt + 1 == max_retries:
+                    break
+                wait = _retry_delay(attempt, exc)
                 logger.warning(
                     "openrouter_request_failed",
                     attempt=attempt + 1,
-                    wait=wait,
+                    wait=round(wait, 2),
                     error=str(exc),
                 )
                 await asyncio.sleep(wait)
@@ -196,21 +352,21 @@ class OpenRouterClient:
     def _parse_rows(raw: str) -> tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
         """Try to parse *raw* as the expected ``{"rows": [...]}`` JSON."""
         try:
-            # Strip potential markdown fences
-            text = raw.strip()
-            if text.startswith("```"):
-                text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-                if text.endswith("```"):
-                    text = text[:-3]
-                text = text.strip()
-
-            data = json.loads(text)
+            # Strip potential markdown fences. The regex fails on the first
+            # non-space character of plain JSON, and orjson accepts surrounding
+            # whitespace, so the common case parses *raw* without any copy.
+            m = _FENCE_RE.match(raw)
+            text = m.group(1) if m else raw
+
+            data = orjson.loads(text)
             if not isinstance(data, dict) or "rows" not in data:
                 return None, "Top-level JSON must have a 'rows' key"
             if not isinstance(data["rows"], list):
                 return None, "'rows' must be an array"
+            if not all(isinstance(row, dict) for row in data["rows"]):
+                return None, "Every item in 'rows' must be an object"
             return data["rows"], None
-        except json.JSONDecodeError as exc:
+        except orjson.JSONDecodeError as exc:
             return None, str(exc)
 
     @staticmethod
@@ -218,5 +374,28 @@ class OpenRouterClient:
         """Encode image bytes as a base64 data URL."""
         if not mime_type:
             mime_type = "image/jpeg"
-        b64 = base64.b64encode(image_bytes).decode("ascii")
-        return f"data:{mime_type};base64,{b64}"
+        # pybase64 encodes with SIMD kernels straight into a str, skipping the
+        # intermediate bytes object and its ASCII decode.
+        return "data:" + mime_type + ";base64," + pybase64.b64encode_as_string(image_bytes)
+
+
+# ── Retry helpers ───────────────────────────────────────
+
+
+def _is_retryable(status_code: int) -> bool:
+    """Timeouts, rate limits and server errors are worth retrying."""
+    return status_code in (408, 429) or status_code >= 500
+
+
+def _retry_delay(attempt: int, exc: Exception) -> float:
+    """Seconds to wait before retry number *attempt* + 1."""
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in (429, 503):
+        retry_after = exc.response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                # Never park a worker longer than the backoff cap.
+                return min(RETRY_BACKOFF_CAP, max(0.0, float(retry_after)))
+            except ValueError:
+                pass  # HTTP-date form: fall back to backoff
+    backoff = min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2**attempt)
+    return backoff * (1.0 + _rng.random() * RETRY_JITTER)
@@ -2,18 +2,17 @@
 
 from __future__ import annotations
 
-import json
-from pathlib import Path
+import asyncio
+import weakref
+from operator import itemgetter
 from typing import Any, Dict, List
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-
+from app.utils.credentials import fresh_http, service_account_credentials, service_for
 from app.utils.logging import get_logger
 
 logger = get_logger("sheets_service")
 
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+SCOPES = ("https://www.googleapis.com/auth/spreadsheets",)
 
 # Exact column order (16 columns).
 COLUMNS = [
@@ -35,13 +34,21 @@ COLUMNS = [
     "fileLink",
 ]
 
+# C-level lookup of all columns at once (rows from normalize_row have every key).
+_ROW_VALUES = itemgetter(*COLUMNS)
+
+# One lock per spreadsheet: appends to the same sheet stay ordered while
+# different sheets can be written in parallel. Entries vanish once no append
+# holds or awaits the lock, so user-supplied sheet IDs can't pile up.
+_sheet_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
 
 class SheetsService:
     """Wraps Google Sheets API v4 for appending rows."""
 
     def __init__(self, service_account_json: str) -> None:
-        creds = self._build_credentials(service_account_json)
-        self.service = build("sheets", "v4", credentials=creds)
+        self.credentials = service_account_credentials(service_account_json, SCOPES)
+        self.service = service_for(service_account_json, "sheets", "v4", SCOPES)
 
     # ── Public API ──────────────────────────────────
 
@@ -55,7 +62,11 @@ class SheetsService:
         if not rows:
             return 0
 
-        values = [[row.get(col) for col in COLUMNS] for row in rows]
+        try:
+            values = [list(_ROW_VALUES(row)) for row in rows]
+        except KeyError:
+            # Rows not produced by normalize_row may omit columns.
+            values = [[row.get(col) for col in COLUMNS] for row in rows]
 
         body = {"values": values}
         result = (
@@ -67,7 +78,7 @@ class SheetsService:
                 valueInputOption="RAW",
                 body=body,
             )
-            .execute()
+            .execute(http=fresh_http(self.credentials))
         )
 
         updates = result.get("updates", {})
@@ -80,22 +91,26 @@ class SheetsService:
         )
         return appended
 
+    async def append_rows_async(
+        self,
+        sheet_id: str,
+        sheet_name: str,
+        rows: List[Dict[str, Any]],
+    ) -> int:
+        """Run :meth:`append_rows` in a worker thread, serialised per sheet."""
+        lock = _sheet_locks.get(sheet_id)
+        if lock is None:
+            lock = _sheet_locks[sheet_id] = asyncio.Lock()
+        async with lock:
+            return await asyncio.to_thread(self.append_rows, sheet_id, sheet_name, rows)
+
     def check_connectivity(self, sheet_id: str | None = None) -> bool:
         """Quick connectivity check."""
         try:
             if sheet_id:
-                self.service.spreadsheets().get(spreadsheetId=sheet_id).execute()
+                self.service.spreadsheets().get(spreadsheetId=sheet_id).execute(
+                    http=fresh_http(self.credentials)
+                )
             return True
         except Exception:
             return False
-
-    # ── Private helpers ─────────────────────────────
-
-    @staticmethod
-    def _build_credentials(raw: str) -> service_account.Credentials:
-        raw = raw.strip()
-        if raw.startswith("{"):
-            info = json.loads(raw)
-        else:
-            info = json.loads(Path(raw).read_text(encoding="utf-8"))
-        return service_account.Credentials.from_service_account_info(info, scopes=SCOPES)
@@ -0,0 +1,54 @@
+"""Google service-account credentials and API client helpers."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import httplib2
+import orjson
+from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+
+
+@lru_cache(maxsize=8)
+def service_account_credentials(
+    raw: str, scopes: tuple[str, ...]
+) -> service_account.Credentials:
+    """Parse a service-account key once per (key, scopes) pair.
+
+    *raw* is either the JSON document itself or a path to it.
+    """
+    raw = raw.strip()
+    if raw.startswith("{"):
+        info = orjson.loads(raw)
+    else:
+        info = orjson.loads(Path(raw).read_bytes())
+    return service_account.Credentials.from_service_account_info(info, scopes=scopes)
+
+
+@lru_cache(maxsize=8)
+def service_for(raw: str, api: str, version: str, scopes: tuple[str, ...]) -> Any:
+    """Build a googleapiclient resource once per key and API, and reuse it.
+
+    ``static_discovery`` uses the discovery document bundled with
+    googleapiclient instead of fetching it over the network.
+    """
+    return build(
+        api,
+        version,
+        credentials=service_account_credentials(raw, scopes),
+        static_discovery=True,
+    )
+
+
+def fresh_http(credentials: service_account.Credentials) -> AuthorizedHttp:
+    """Return a new authorised transport for one request.
+
+    The cached resources from :func:`service_for` share a single
+    ``httplib2.Http``, which is not thread-safe. Calls made from worker
+    threads pass this as ``.execute(http=...)`` instead.
+    """
+    return AuthorizedHttp(credentials, http=httplib2.Http())
@@ -4,34 +4,61 @@ from __future__ import annotations
 
 import logging
 import sys
+from typing import Any
 
+import orjson
 import structlog
 
+_ERROR_METHODS = frozenset({"error", "critical", "exception"})
+_stack_info = structlog.processors.StackInfoRenderer()
+
+
+def _error_details(logger: Any, method_name: str, event_dict: dict) -> dict:
+    """Attach exception and stack info, but only for error-level records."""
+    if method_name not in _ERROR_METHODS:
+        return event_dict
+    event_dict = structlog.dev.set_exc_info(logger, method_name, event_dict)
+    event_dict = _stack_info(logger, method_name, event_dict)
+    return structlog.processors.format_exc_info(logger, method_name, event_dict)
+
 
 def setup_logging(log_level: str = "INFO") -> None:
     """Configure structlog with JSON rendering for production."""
+    # Write orjson's bytes straight to stderr when it exposes a binary buffer;
+    # otherwise (a text-only or missing stream) decode and print as before.
+    buffer = getattr(sys.stderr, "buffer", None)
+    if buffer is not None:
+        serializer: Any = orjson.dumps
+        logger_factory: Any = structlog.BytesLoggerFactory(file=buffer)
+    else:
+        serializer = lambda obj, **kw: orjson.dumps(obj, **kw).decode()  # noqa: E731
+        logger_factory = structlog.PrintLoggerFactory(file=sys.stderr)
 
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
-            structlog.processors.StackInfoRenderer(),
-            structlog.dev.set_exc_info,
+            _error_details,
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(
+                serializer=serializer, option=orjson.OPT_NON_STR_KEYS
+            ),
         ],
         wrapper_class=structlog.make_filtering_bound_logger(
             getattr(logging, log_level.upper(), logging.INFO)
         ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(file=sys.stderr),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
 
 def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
-    """Return a structured logger, optionally bound with a name."""
-    logger = structlog.get_logger()
+    """Return a structured logger, optionally bound with a name.
+
+    The proxy stays lazy, so module-level loggers created before
+    ``setup_logging`` still pick up its configuration.
+    """
     if name:
-        logger = logger.bind(module=name)
-    return logger
+        return structlog.get_logger(module=name)
+    return structlog.get_logger()
@@ -2,24 +2,26 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import List
+from os.path import splitext
+from typing import Collection
 
 ALLOWED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
 
 
 def is_valid_image_extension(filename: str) -> bool:
     """Check whether *filename* has an allowed image extension."""
-    return Path(filename).suffix.lower() in ALLOWED_IMAGE_EXTENSIONS
+    return splitext(filename)[1].lower() in ALLOWED_IMAGE_EXTENSIONS
 
 
 def validate_model_selection(
     requested_model: str | None,
     default_model: str,
-    allowed_models: List[str],
+    allowed_models: Collection[str],
 ) -> tuple[str, str | None]:
     """Resolve which model to use.
 
+    Pass a set (e.g. ``Settings.allowed_model_set``) for O(1) membership.
+
     Returns
     -------
     (model_id, error_message | None)
@@ -31,4 +33,4 @@ def validate_model_selection(
     if requested_model in allowed_models:
         return requested_model, None
 
-    return "", f"Model '{requested_model}' not allowed. Allowed: {allowed_models}"
+    return "", f"Model '{requested_model}' not allowed. Allowed: {sorted(allowed_models)}"
@@ -0,0 +1,84 @@
+"""Unit tests for service-account credentials and API client helpers."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.utils import credentials
+from google_auth_httplib2 import AuthorizedHttp
+
+from app.utils.credentials import fresh_http, service_account_credentials, service_for
+
+KEY = {"type": "service_account", "client_email": "svc@example.com"}
+
+
+@pytest.fixture(autouse=True)
+def _fake_key_parsing(monkeypatch):
+    calls = []
+
+    def from_info(info, scopes):
+        calls.append((info, scopes))
+        return object()
+
+    monkeypatch.setattr(
+        credentials.service_account.Credentials, "from_service_account_info", from_info
+    )
+    service_account_credentials.cache_clear()
+    service_for.cache_clear()
+    yield calls
+    service_account_credentials.cache_clear()
+    service_for.cache_clear()
+
+
+class TestServiceAccountCredentials:
+    def test_parses_json_string_once(self, _fake_key_parsing):
+        raw = json.dumps(KEY)
+
+        first = service_account_credentials(raw, ("scope-a",))
+        assert service_account_credentials(raw, ("scope-a",)) is first
+        assert _fake_key_parsing == [(KEY, ("scope-a",))]
+
+    def test_reads_key_file(self, tmp_path, _fake_key_parsing):
+        path = tmp_path / "sa.json"
+        path.write_text(json.dumps(KEY))
+
+        service_account_credentials(f" {path} ", ("scope-a",))
+        assert _fake_key_parsing == [(KEY, ("scope-a",))]
+
+    def test_scopes_are_part_of_the_key(self, _fake_key_parsing):
+        raw = json.dumps(KEY)
+
+        a = service_account_credentials(raw, ("scope-a",))
+        b = service_account_credentials(raw, ("scope-b",))
+        assert a is not b
+        assert len(_fake_key_parsing) == 2
+
+
+class TestServiceFor:
+    def test_builds_once_per_api(self, monkeypatch):
+        builds = []
+
+        def build(api, version, **kwargs):
+            builds.append((api, version, kwargs["static_discovery"]))
+            return object()
+
+        monkeypatch.setattr(credentials, "build", build)
+        raw = json.dumps(KEY)
+
+        drive = service_for(raw, "drive", "v3", ("scope-a",))
+        assert service_for(raw, "drive", "v3", ("scope-a",)) is drive
+        assert service_for(raw, "sheets", "v4", ("scope-b",)) is not drive
+        assert builds == [("drive", "v3", True), ("sheets", "v4", True)]
+
+
+class TestFreshHttp:
+    def test_new_transport_per_call(self):
+        creds = object()
+
+        first, second = fresh_http(creds), fresh_http(creds)
+
+        assert isinstance(first, AuthorizedHttp)
+        assert first.credentials is creds
+        assert first.http is not second.http
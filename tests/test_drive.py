@@ -0,0 +1,166 @@
+"""Unit tests for drive_service — async listing, download and token refresh."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import respx
+
+from app.services import drive_service
+from app.services.drive_service import DRIVE_FILES_URL, FOLDER_MIME_TYPE, DriveService
+
+
+def _service(valid: bool = True) -> DriveService:
+    svc = DriveService.__new__(DriveService)
+    svc.credentials = MagicMock(valid=valid, token="tok")
+    svc.service = MagicMock()
+    return svc
+
+
+def _image(file_id: str) -> Dict[str, Any]:
+    return {"id": file_id, "name": f"{file_id}.jpg", "mimeType": "image/jpeg"}
+
+
+def _folder(file_id: str) -> Dict[str, Any]:
+    return {"id": file_id, "name": file_id, "mimeType": FOLDER_MIME_TYPE}
+
+
+def _listing(pages: Dict[str, List[List[Dict[str, Any]]]]):
+    """Serve ``files.list`` pages per parent folder, keyed on the query."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        folder_id = request.url.params["q"].split("'")[1]
+        page = int(request.url.params.get("pageToken", 0))
+        body: Dict[str, Any] = {"files": pages[folder_id][page]}
+        if page + 1 < len(pages[folder_id]):
+            body["nextPageToken"] = str(page + 1)
+        return httpx.Response(200, json=body)
+
+    return handler
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    # Each test runs on its own event loop; don't reuse a client across them.
+    drive_service._http = None
+    yield
+    drive_service._http = None
+
+
+class TestListFilesAsync:
+    @respx.mock
+    async def test_follows_pagination(self):
+        route = respx.get(DRIVE_FILES_URL).mock(
+            side_effect=_listing({"root": [[_image("a")], [_image("b")]]})
+        )
+
+        files = await _service().list_files_async("root")
+
+        assert [f["id"] for f in files] == ["a", "b"]
+        assert route.call_count == 2
+        assert route.calls[0].request.headers["Authorization"] == "Bearer tok"
+
+    @respx.mock
+    async def test_recurses_into_subfolders(self):
+        respx.get(DRIVE_FILES_URL).mock(
+            side_effect=_listing(
+                {
+                    "root": [[_image("a"), _folder("sub")]],
+                    "sub": [[_image("b"), _folder("deeper")]],
+                    "deeper": [[_image("c")]],
+                }
+            )
+        )
+
+        files = await _service().list_files_async("root", recursive=True)
+
+        assert sorted(f["id"] for f in files) == ["a", "b", "c"]
+
+    @respx.mock
+    async def test_non_recursive_skips_subfolders(self):
+        route = respx.get(DRIVE_FILES_URL).mock(
+            side_effect=_listing({"root": [[_image("a"), _folder("sub")]]})
+        )
+
+        files = await _service().list_files_async("root")
+
+        assert [f["id"] for f in files] == ["a"]
+        assert route.call_count == 1
+
+    @respx.mock
+    async def test_folder_cycle_is_listed_once(self):
+        route = respx.get(DRIVE_FILES_URL).mock(
+            side_effect=_listing(
+                {
+                    "root": [[_folder("sub")]],
+                    "sub": [[_image("a"), _folder("root")]],
+                }
+            )
+        )
+
+        files = await _service().list_files_async("root", recursive=True)
+
+        assert [f["id"] for f in files] == ["a"]
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_http_error_propagates(self):
+        respx.get(DRIVE_FILES_URL).mock(return_value=httpx.Response(403))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await _service().list_files_async("root")
+
+
+class TestDownloadFileAsync:
+    @respx.mock
+    async def test_returns_media_bytes(self):
+        route = respx.get(f"{DRIVE_FILES_URL}/f1").mock(
+            return_value=httpx.Response(200, content=b"\xff\xd8jpeg")
+        )
+
+        assert await _service().download_file_async("f1") == b"\xff\xd8jpeg"
+
+        request = route.calls.last.request
+        assert request.url.params["alt"] == "media"
+        assert request.headers["Authorization"] == "Bearer tok"
+
+    @respx.mock
+    async def test_missing_file_raises(self):
+        respx.get(f"{DRIVE_FILES_URL}/gone").mock(return_value=httpx.Response(404))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await _service().download_file_async("gone")
+
+
+class TestAuthHeaders:
+    async def test_valid_token_is_not_refreshed(self):
+        svc = _service(valid=True)
+
+        assert await svc._auth_headers() == {"Authorization": "Bearer tok"}
+        svc.credentials.refresh.assert_not_called()
+
+    async def test_expired_token_is_refreshed_once(self):
+        svc = _service(valid=False)
+
+        def refresh(_request):
+            svc.credentials.valid = True
+            svc.credentials.token = "new"
+
+        svc.credentials.refresh.side_effect = refresh
+
+        headers = await asyncio.gather(*[svc._auth_headers() for _ in range(5)])
+
+        assert headers == [{"Authorization": "Bearer new"}] * 5
+        svc.credentials.refresh.assert_called_once()
+
+
+class TestCheckConnectivity:
+    def test_failure(self):
+        svc = _service()
+        svc.service.files.return_value.list.return_value.execute.side_effect = RuntimeError
+
+        assert svc.check_connectivity() is False
@@ -14,6 +14,13 @@ from app.main import app
 client = TestClient(app)
 
 
+@pytest.fixture(scope="module", autouse=True)
+def _lifespan():
+    """Run app startup/shutdown so shared clients exist on ``app.state``."""
+    with client:
+        yield
+
+
 # ── GET /models ─────────────────────────────────────────
 
 
@@ -27,6 +34,25 @@ class TestModelsEndpoint:
         assert isinstance(data["allowed"], list)
 
 
+# ── GET /healthz ────────────────────────────────────────
+
+
+class TestHealthEndpoint:
+    def test_reports_each_service(self):
+        with patch.object(
+            app.state.or_client, "check_connectivity", AsyncMock(return_value=True)
+        ), patch("app.main.settings.GOOGLE_SERVICE_ACCOUNT_JSON", ""):
+            resp = client.get("/healthz")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["status"] == "degraded"
+        assert data["services"] == {
+            "openrouter": "ok",
+            "google_drive": "error",
+            "google_sheets": "error",
+        }
+
+
 # ── POST /batch/folder — Validation ────────────────────
 
 
@@ -73,9 +99,13 @@ class TestBatchFolderDryRun:
     @patch("app.main.local_service.scan_folder")
     @patch("app.main.process_batch", new_callable=AsyncMock)
     def test_local_dry_run(self, mock_batch, mock_scan):
-        mock_scan.return_value = [
-            {"fileName": "test.jpg", "filePath": "/tmp/test.jpg", "fileId": None, "fileLink": None}
-        ]
+        # scan_folder is a generator; the endpoint closes it after slicing.
+        mock_scan.return_value = (
+            f
+            for f in [
+                {"fileName": "test.jpg", "filePath": "/tmp/test.jpg", "fileId": None, "fileLink": None}
+            ]
+        )
         mock_batch.return_value = {
             "rows": [
                 {
@@ -97,6 +127,7 @@ class TestBatchFolderDryRun:
                     "fileLink": None,
                 }
             ],
+            "rows_extracted": 1,
             "errors": [],
             "files_processed": 1,
         }
@@ -117,3 +148,34 @@ class TestBatchFolderDryRun:
         assert data["dryRun"] is True
         assert data["rowsAppended"] == 0
         assert len(data["rows"]) >= 1
+
+
+# ── process_batch pipeline ──────────────────────────────
+
+
+class TestProcessBatch:
+    async def test_keeps_file_order_and_collects_errors(self, tmp_path):
+        from app.services.extractor_service import process_batch
+
+        files = []
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            (tmp_path / name).write_bytes(name.encode())
+            files.append({"fileName": name, "filePath": str(tmp_path / name)})
+        files.append({"fileName": "missing.jpg", "filePath": str(tmp_path / "missing.jpg")})
+
+        async def fake_extract(image_bytes, mime_type, file_meta, model):
+            name = image_bytes.decode()
+            # Like the real client, stamp the file metadata onto every row.
+            return [{"fullName": name, "email1": f"{name}@x.com", **file_meta}]
+
+        or_client = AsyncMock()
+        or_client.extract_card_data.side_effect = fake_extract
+
+        result = await process_batch(files, concurrency=2, client=or_client, model="m")
+
+        assert [r["fullName"] for r in result["rows"]] == ["a.jpg", "b.jpg", "c.jpg"]
+        assert result["rows_extracted"] == 3
+        assert result["rows"][0]["fileName"] == "a.jpg"
+        assert result["files_processed"] == 4
+        assert len(result["errors"]) == 1
+        assert result["errors"][0]["fileName"] == "missing.jpg"
@@ -0,0 +1,78 @@
+"""Unit tests for local_service — folder scanning."""
+
+from __future__ import annotations
+
+from itertools import islice
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services import local_service
+from app.services.local_service import scan_folder
+
+
+class TestScanFolder:
+    def test_finds_images_recursively(self, tmp_path):
+        (tmp_path / "a.jpg").write_bytes(b"")
+        (tmp_path / "B.PNG").write_bytes(b"")
+        (tmp_path / "notes.txt").write_bytes(b"")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "c.webp").write_bytes(b"")
+
+        found = {f["fileName"]: f for f in scan_folder(str(tmp_path))}
+
+        assert set(found) == {"a.jpg", "B.PNG", "c.webp"}
+        assert found["c.webp"]["filePath"] == str(tmp_path / "sub" / "c.webp")
+        assert found["a.jpg"]["fileId"] is None
+
+    def test_missing_folder(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            list(scan_folder(str(tmp_path / "missing")))
+
+    def test_bare_extension_names_are_not_images(self, tmp_path):
+        (tmp_path / "jpg").write_bytes(b"")
+        (tmp_path / "png").write_bytes(b"")
+        (tmp_path / "d.jpeg").write_bytes(b"")
+
+        assert [f["fileName"] for f in scan_folder(str(tmp_path))] == ["d.jpeg"]
+
+    def test_follows_symlinked_files(self, tmp_path):
+        target = tmp_path / "real.png"
+        target.write_bytes(b"")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "link.png").symlink_to(target)
+
+        names = {f["fileName"] for f in scan_folder(str(tmp_path))}
+
+        assert names == {"real.png", "link.png"}
+
+    def test_skips_unreadable_subdirectories(self, tmp_path, monkeypatch):
+        (tmp_path / "a.jpg").write_bytes(b"")
+        (tmp_path / "locked").mkdir()
+        (tmp_path / "locked" / "b.jpg").write_bytes(b"")
+        locked = str(tmp_path / "locked")
+        real_scandir = local_service.os.scandir
+
+        def scandir(path):
+            if path == locked:
+                raise PermissionError(path)
+            return real_scandir(path)
+
+        monkeypatch.setattr(local_service.os, "scandir", scandir)
+
+        assert [f["fileName"] for f in scan_folder(str(tmp_path))] == ["a.jpg"]
+
+    def test_logs_scan_when_closed_early(self, tmp_path, monkeypatch):
+        for name in ("a.jpg", "b.jpg"):
+            (tmp_path / name).write_bytes(b"")
+        logger = MagicMock()
+        monkeypatch.setattr(local_service, "logger", logger)
+
+        scan = scan_folder(str(tmp_path))
+        assert len(list(islice(scan, 1))) == 1
+        logger.info.assert_not_called()
+
+        scan.close()
+        logger.info.assert_called_once_with(
+            "local_folder_scanned", folder=str(tmp_path), images_found=1
+        )
@@ -0,0 +1,104 @@
+"""Unit tests for logging setup — error-only processors and byte output."""
+
+from __future__ import annotations
+
+import io
+import sys
+from types import SimpleNamespace
+
+import orjson
+import pytest
+import structlog
+
+from app.utils.logging import _error_details, get_logger, setup_logging
+
+
+@pytest.fixture
+def restore_config():
+    saved = structlog.get_config()
+    yield
+    structlog.configure(**saved)
+
+
+@pytest.fixture
+def stderr(monkeypatch):
+    """Route a freshly configured logger into an in-memory stderr."""
+    saved = structlog.get_config()
+    buf = io.BytesIO()
+    monkeypatch.setattr(sys, "stderr", SimpleNamespace(buffer=buf))
+    setup_logging("INFO")
+    yield buf
+    structlog.configure(**saved)
+
+
+def _records(buf: io.BytesIO) -> list[dict]:
+    return [orjson.loads(line) for line in buf.getvalue().splitlines()]
+
+
+class TestErrorDetails:
+    def test_info_records_are_untouched(self):
+        event = {"event": "hi", "exc_info": True}
+        assert _error_details(None, "info", dict(event)) == event
+
+    def test_exception_renders_traceback(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            event = _error_details(None, "exception", {"event": "failed"})
+
+        assert "exc_info" not in event
+        assert "ValueError: boom" in event["exception"]
+
+    def test_error_without_exception(self):
+        assert _error_details(None, "error", {"event": "failed"}) == {"event": "failed"}
+
+
+class TestSetupLogging:
+    def test_writes_json_lines_as_bytes(self, stderr):
+        get_logger("x").info("hello", n=1)
+
+        [record] = _records(stderr)
+        assert record["event"] == "hello"
+        assert record["module"] == "x"
+        assert record["n"] == 1
+        assert record["level"] == "info"
+
+    def test_non_str_dict_keys(self, stderr):
+        get_logger().info("k", d={1: 2})
+
+        assert _records(stderr)[0]["d"] == {"1": 2}
+
+    def test_unserialisable_values_fall_back_to_repr(self, stderr):
+        get_logger().info("k", obj=object())
+
+        assert _records(stderr)[0]["obj"].startswith("<object object")
+
+    def test_below_level_is_dropped(self, stderr):
+        get_logger().debug("quiet")
+
+        assert stderr.getvalue() == b""
+
+    def test_logger_created_before_setup_uses_new_config(self, monkeypatch, restore_config):
+        structlog.reset_defaults()
+        early = get_logger("early")  # as a service module does at import time
+
+        buf = io.BytesIO()
+        monkeypatch.setattr(sys, "stderr", SimpleNamespace(buffer=buf))
+        setup_logging("INFO")
+        early.debug("filtered")
+        early.info("hello")
+
+        [record] = _records(buf)
+        assert record["event"] == "hello"
+        assert record["module"] == "early"
+
+    def test_text_only_stderr_falls_back_to_print_logger(self, monkeypatch, restore_config):
+        out = io.StringIO()
+        monkeypatch.setattr(sys, "stderr", out)
+        setup_logging("INFO")
+
+        get_logger("x").info("hello", d={1: 2})
+
+        record = orjson.loads(out.getvalue())
+        assert record["event"] == "hello"
+        assert record["d"] == {"1": 2}
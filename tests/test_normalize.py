@@ -8,6 +8,7 @@ import pytest
 
 from app.services.normalize_service import (
     normalize_row,
+    normalize_rows,
     _clamp_confidence,
     _default_timestamp,
     _normalize_email,
@@ -143,6 +144,9 @@ class TestDefaultTimestamp:
         result = _default_timestamp("")
         assert "T" in result
 
+    def test_explicit_default(self):
+        assert _default_timestamp(None, "2025-06-01T00:00:00+00:00") == "2025-06-01T00:00:00+00:00"
+
 
 # ── Full row normalisation ──────────────────────────────
 
@@ -178,3 +182,17 @@ class TestNormalizeRow:
         assert result["notes"] is None        # empty → None
         assert result["confidence"] == 0.856
         assert result["timestamp"] is not None  # defaulted
+
+
+class TestNormalizeRows:
+    def test_shares_default_timestamp(self):
+        rows = normalize_rows([{"fullName": "A"}, {"fullName": "B", "timestamp": None}])
+        assert rows[0]["timestamp"] == rows[1]["timestamp"]
+        assert "T" in rows[0]["timestamp"]
+
+    def test_keeps_existing_timestamp(self):
+        rows = normalize_rows(
+            [{"timestamp": "2025-01-01T00:00:00Z"}, {}], default_ts="2025-06-01T00:00:00+00:00"
+        )
+        assert rows[0]["timestamp"] == "2025-01-01T00:00:00Z"
+        assert rows[1]["timestamp"] == "2025-06-01T00:00:00+00:00"
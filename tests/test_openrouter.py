@@ -2,11 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
 import json
 
+from unittest.mock import AsyncMock
+
+import httpx
 import pytest
+import respx
+
+from app.services import openrouter_client
+from app.services.openrouter_client import (
+    OPENROUTER_API_URL,
+    OPENROUTER_MODELS_URL,
+    OpenRouterClient,
+)
 
-from app.services.openrouter_client import OpenRouterClient
+
+def _completion(content: str) -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
 
 
 class TestParseRows:
@@ -18,6 +33,11 @@ class TestParseRows:
         assert err is None
         assert rows == [{"fullName": "Alice"}]
 
+    def test_surrounding_whitespace(self):
+        rows, err = OpenRouterClient._parse_rows('\n  {"rows": []}  \n')
+        assert err is None
+        assert rows == []
+
     def test_empty_rows(self):
         raw = json.dumps({"rows": []})
         rows, err = OpenRouterClient._parse_rows(raw)
@@ -41,12 +61,30 @@ class TestParseRows:
         assert rows is None
         assert "array" in err
 
+    def test_rows_items_not_objects(self):
+        rows, err = OpenRouterClient._parse_rows(json.dumps({"rows": [{"a": 1}, "junk"]}))
+        assert rows is None
+        assert "object" in err
+
     def test_strips_markdown_fences(self):
         raw = '```json\n{"rows": [{"fullName": "Bob"}]}\n```'
         rows, err = OpenRouterClient._parse_rows(raw)
         assert err is None
         assert rows == [{"fullName": "Bob"}]
 
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            '  ```\n{"rows": []}\n```  ',
+            '```json\n{"rows": []}',
+            '```{"rows": []}```',
+        ],
+    )
+    def test_fence_variants(self, raw):
+        rows, err = OpenRouterClient._parse_rows(raw)
+        assert err is None
+        assert rows == []
+
 
 class TestBytesToDataUrl:
     def test_jpeg(self):
@@ -60,3 +98,216 @@ class TestBytesToDataUrl:
     def test_default_mime(self):
         url = OpenRouterClient._bytes_to_data_url(b"bytes", "")
         assert url.startswith("data:image/jpeg;base64,")
+
+    def test_matches_stdlib_encoding(self):
+        data = bytes(range(256)) * 50
+        url = OpenRouterClient._bytes_to_data_url(data, "image/png")
+        assert url == "data:image/png;base64," + base64.b64encode(data).decode("ascii")
+
+
+class TestCallApi:
+    @respx.mock
+    async def test_sends_auth_headers_on_shared_client(self):
+        route = respx.post(OPENROUTER_API_URL).mock(return_value=_completion("ok"))
+        client = OpenRouterClient("sk-test")
+
+        assert await client._call_api("m", [{"role": "user", "content": "hi"}]) == "ok"
+        assert await client._call_api("m", [{"role": "user", "content": "hi"}]) == "ok"
+        await client.aclose()
+
+        request = route.calls.last.request
+        assert request.headers["Authorization"] == "Bearer sk-test"
+        assert request.headers["X-Title"] == "Business Card Extractor"
+        assert request.headers["Content-Type"] == "application/json"
+        assert json.loads(request.content)["model"] == "m"
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_body_splices_preencoded_system_message(self):
+        route = respx.post(OPENROUTER_API_URL).mock(return_value=_completion("ok"))
+        client = OpenRouterClient("sk-test")
+        user = {"role": "user", "content": [{"type": "text", "text": "hi"}]}
+
+        await client._call_api("m", [openrouter_client.SYSTEM_MESSAGE, user])
+
+        assert json.loads(route.calls.last.request.content) == {
+            "model": "m",
+            "messages": [openrouter_client.SYSTEM_MESSAGE, user],
+        }
+
+    @respx.mock
+    async def test_honours_retry_after_on_429(self, monkeypatch):
+        sleep = AsyncMock()
+        monkeypatch.setattr(openrouter_client.asyncio, "sleep", sleep)
+        respx.post(OPENROUTER_API_URL).mock(
+            side_effect=[httpx.Response(429, headers={"Retry-After": "7"}), _completion("ok")]
+        )
+        client = OpenRouterClient("sk-test")
+
+        assert await client._call_api("m", []) == "ok"
+        sleep.assert_awaited_once_with(7.0)
+
+    @pytest.mark.parametrize("header", ["3600", "inf"])
+    @respx.mock
+    async def test_retry_after_is_capped(self, monkeypatch, header):
+        sleep = AsyncMock()
+        monkeypatch.setattr(openrouter_client.asyncio, "sleep", sleep)
+        respx.post(OPENROUTER_API_URL).mock(
+            side_effect=[httpx.Response(503, headers={"Retry-After": header}), _completion("ok")]
+        )
+        client = OpenRouterClient("sk-test")
+
+        assert await client._call_api("m", []) == "ok"
+        sleep.assert_awaited_once_with(openrouter_client.RETRY_BACKOFF_CAP)
+
+    @respx.mock
+    async def test_does_not_retry_client_errors(self, monkeypatch):
+        sleep = AsyncMock()
+        monkeypatch.setattr(openrouter_client.asyncio, "sleep", sleep)
+        route = respx.post(OPENROUTER_API_URL).mock(return_value=httpx.Response(401))
+        client = OpenRouterClient("sk-test")
+
+        with pytest.raises(RuntimeError, match="rejected"):
+            await client._call_api("m", [])
+        assert route.call_count == 1
+        sleep.assert_not_awaited()
+
+    @respx.mock
+    async def test_backoff_is_capped_and_skipped_after_last_attempt(self, monkeypatch):
+        sleep = AsyncMock()
+        monkeypatch.setattr(openrouter_client.asyncio, "sleep", sleep)
+        route = respx.post(OPENROUTER_API_URL).mock(return_value=httpx.Response(500))
+        client = OpenRouterClient("sk-test")
+
+        with pytest.raises(RuntimeError, match="after 3 retries"):
+            await client._call_api("m", [])
+        assert route.call_count == 3
+        assert sleep.await_count == 2
+        for call, base in zip(sleep.await_args_list, (1.0, 2.0)):
+            assert base <= call.args[0] <= base * 1.5
+
+
+class TestExtractCardData:
+    @staticmethod
+    def _image_url(mock_call: AsyncMock) -> str:
+        messages = mock_call.call_args.args[1]
+        return messages[1]["content"][0]["image_url"]["url"]
+
+    async def test_sends_data_url_by_default(self):
+        client = OpenRouterClient("sk-test")
+        client._call_api = AsyncMock(return_value='{"rows": []}')
+        meta = {"fileName": "a.jpg", "fileLink": "https://example.com/a.jpg"}
+
+        assert await client.extract_card_data(b"img", "image/jpeg", meta, "m") == []
+        assert self._image_url(client._call_api).startswith("data:image/jpeg;base64,")
+
+    async def test_prefer_url_uses_https_file_link(self):
+        client = OpenRouterClient("sk-test")
+        client._call_api = AsyncMock(return_value='{"rows": []}')
+        meta = {"fileName": "a.jpg", "fileLink": "https://example.com/a.jpg"}
+
+        await client.extract_card_data(b"img", "image/jpeg", meta, "m", prefer_url=True)
+        assert self._image_url(client._call_api) == "https://example.com/a.jpg"
+
+
+class TestExtractMany:
+    async def test_keeps_order_and_isolates_failures(self):
+        client = OpenRouterClient("sk-test")
+
+        async def fake_extract(image_bytes, mime_type, file_meta, model):
+            if image_bytes == b"bad":
+                raise ValueError("boom")
+            return [{"fullName": image_bytes.decode()}]
+
+        client.extract_card_data = fake_extract
+        items = [(b"a", "image/jpeg", {}), (b"bad", "image/jpeg", {}), (b"c", "image/png", {})]
+
+        results = await client.extract_many(items, "m", concurrency=2)
+
+        assert results[0] == [{"fullName": "a"}]
+        assert isinstance(results[1], ValueError)
+        assert results[2] == [{"fullName": "c"}]
+
+
+class TestExtractionCache:
+    async def test_duplicate_image_skips_model_call(self):
+        client = OpenRouterClient("sk-test")
+        client._call_api = AsyncMock(
+            return_value=json.dumps({"rows": [{"fullName": "Alice", "fileName": "a.jpg"}]})
+        )
+
+        first = await client.extract_card_data(b"same", "image/jpeg", {"fileName": "a.jpg"}, "m")
+        first[0]["fullName"] = "mutated by caller"
+        second = await client.extract_card_data(b"same", "image/jpeg", {"fileName": "b.jpg"}, "m")
+
+        assert client._call_api.await_count == 1
+        assert second == [{"fullName": "Alice", "fileName": "b.jpg"}]
+        assert client.cache_info()["hits"] == 1
+
+    async def test_keyed_by_model_and_bounded(self):
+        client = OpenRouterClient("sk-test", cache_size=1)
+        client._call_api = AsyncMock(return_value='{"rows": [{"fullName": "A"}]}')
+
+        await client.extract_card_data(b"a", "image/jpeg", {}, "m1")
+        await client.extract_card_data(b"a", "image/jpeg", {}, "m2")
+        await client.extract_card_data(b"a", "image/jpeg", {}, "m1")
+
+        assert client._call_api.await_count == 3
+        assert client.cache_info()["currsize"] == 1
+
+    async def test_miss_and_hit_apply_file_meta_alike(self):
+        client = OpenRouterClient("sk-test")
+        client._call_api = AsyncMock(
+            return_value=json.dumps({"rows": [{"fullName": "A", "fileId": None}]})
+        )
+        meta = {"fileName": "a.jpg", "fileId": "id-1", "fileLink": "https://x/a"}
+
+        miss = await client.extract_card_data(b"a", "image/jpeg", meta, "m")
+        hit = await client.extract_card_data(b"a", "image/jpeg", meta, "m")
+
+        assert miss == hit == [{"fullName": "A", **meta}]
+        assert client.cache_info()["hits"] == 1
+
+    async def test_non_object_rows_are_repaired_not_cached(self):
+        client = OpenRouterClient("sk-test")
+        client._call_api = AsyncMock(return_value='{"rows": ["junk"]}')
+
+        with pytest.raises(ValueError, match="must be an object"):
+            await client.extract_card_data(b"a", "image/jpeg", {}, "m")
+        with pytest.raises(ValueError):
+            await client.extract_card_data(b"a", "image/jpeg", {}, "m")
+
+        assert client._call_api.await_count == 4  # first try + repair, twice
+        assert client.cache_info()["currsize"] == 0
+
+    async def test_empty_result_is_not_cached(self):
+        client = OpenRouterClient("sk-test")
+        client._call_api = AsyncMock(return_value='{"rows": []}')
+
+        assert await client.extract_card_data(b"a", "image/jpeg", {}, "m") == []
+        await client.extract_card_data(b"a", "image/jpeg", {}, "m")
+
+        assert client._call_api.await_count == 2
+        assert client.cache_info()["currsize"] == 0
+
+
+class TestCheckConnectivity:
+    @respx.mock
+    async def test_coalesces_and_caches(self):
+        route = respx.get(OPENROUTER_MODELS_URL).mock(return_value=httpx.Response(200))
+        client = OpenRouterClient("sk-test")
+
+        results = await asyncio.gather(*[client.check_connectivity() for _ in range(5)])
+        assert results == [True] * 5
+        assert await client.check_connectivity() is True
+        assert route.call_count == 1
+
+    @respx.mock
+    async def test_rechecks_after_ttl(self, monkeypatch):
+        route = respx.get(OPENROUTER_MODELS_URL).mock(return_value=httpx.Response(500))
+        client = OpenRouterClient("sk-test")
+
+        assert await client.check_connectivity() is False
+        monkeypatch.setattr(openrouter_client, "CONNECTIVITY_TTL", 0.0)
+        assert await client.check_connectivity() is False
+        assert route.call_count == 2
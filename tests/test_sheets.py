@@ -0,0 +1,109 @@
+"""Unit tests for sheets_service — row value layout."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from google_auth_httplib2 import AuthorizedHttp
+
+from app.services.normalize_service import normalize_row
+from app.services import sheets_service
+from app.services.sheets_service import COLUMNS, SheetsService
+
+
+def _service() -> tuple[SheetsService, MagicMock]:
+    svc = SheetsService.__new__(SheetsService)
+    svc.credentials = MagicMock()
+    svc.service = MagicMock()
+    append = svc.service.spreadsheets.return_value.values.return_value.append
+    append.return_value.execute.return_value = {"updates": {"updatedRows": 1}}
+    return svc, append
+
+
+class TestAppendRows:
+    def test_values_follow_column_order(self):
+        svc, append = _service()
+        row = normalize_row({"fullName": "Alice", "email1": "a@b.com", "timestamp": "t"})
+
+        assert svc.append_rows("sheet", "Sheet1", [row]) == 1
+
+        values = append.call_args.kwargs["body"]["values"]
+        assert values == [[row[col] for col in COLUMNS]]
+
+    def test_partial_rows_fill_missing_columns(self):
+        svc, append = _service()
+
+        svc.append_rows("sheet", "Sheet1", [{"fullName": "Bob"}])
+
+        values = append.call_args.kwargs["body"]["values"]
+        assert values[0][COLUMNS.index("fullName")] == "Bob"
+        assert values[0].count(None) == len(COLUMNS) - 1
+
+    def test_no_rows(self):
+        svc, append = _service()
+        assert svc.append_rows("sheet", "Sheet1", []) == 0
+        append.assert_not_called()
+
+    async def test_async_append_runs_in_worker_thread(self):
+        svc, append = _service()
+        threads = []
+        real_append = svc.append_rows
+
+        def append_rows(*args):
+            threads.append(threading.get_ident())
+            return real_append(*args)
+
+        svc.append_rows = append_rows
+
+        assert await svc.append_rows_async("sheet", "Sheet1", [normalize_row({})]) == 1
+        append.assert_called_once()
+        assert threads and threads[0] != threading.get_ident()
+
+    @pytest.mark.parametrize("sheet_ids, peak", [(["s", "s"], 1), (["s1", "s2"], 2)])
+    async def test_async_appends_serialise_per_sheet(self, sheet_ids, peak):
+        svc, _ = _service()
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(2, timeout=0.2)
+
+        def append_rows(sheet_id, sheet_name, rows):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            try:
+                barrier.wait()  # only passes if both appends overlap
+            except threading.BrokenBarrierError:
+                pass
+            with lock:
+                state["active"] -= 1
+            return 1
+
+        svc.append_rows = append_rows
+
+        await asyncio.gather(*[svc.append_rows_async(s, "Sheet1", []) for s in sheet_ids])
+
+        assert state["peak"] == peak
+        assert not sheets_service._sheet_locks
+
+
+class TestCheckConnectivity:
+    def test_uses_own_transport(self):
+        svc, _ = _service()
+        get = svc.service.spreadsheets.return_value.get
+
+        assert svc.check_connectivity("sheet") is True
+
+        http = get.return_value.execute.call_args.kwargs["http"]
+        assert isinstance(http, AuthorizedHttp)
+        assert http.credentials is svc.credentials
+
+    def test_failure(self):
+        svc, _ = _service()
+        get = svc.service.spreadsheets.return_value.get
+        get.return_value.execute.side_effect = RuntimeError("down")
+
+        assert svc.check_connectivity("sheet") is False